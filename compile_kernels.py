@@ -0,0 +1,25 @@
+"""Собрать ядра расчёта калорий в модуль расширения _homework_aot.
+
+Запуск: python compile_kernels.py
+
+Модуль кладётся рядом с homework.py, и тот при импорте берёт ядра из
+него вместо Python-версий. Нужен установленный Numba и компилятор C.
+"""
+from pathlib import Path
+
+from numba.pycc import CC
+
+import homework
+
+
+def build() -> None:
+    """Скомпилировать все ядра из homework._AOT_KERNELS."""
+    cc = CC('_homework_aot')
+    cc.output_dir = str(Path(homework.__file__).resolve().parent)
+    for name, (signature, func) in homework._AOT_KERNELS.items():
+        cc.export(name, signature)(func)
+    cc.compile()
+
+
+if __name__ == '__main__':
+    build()
@@ -422,6 +422,20 @@ def test_main():
         'Ср. скорость: 0.065 км/ч; '
         'Потрачено ккал: 12.812.'
     ]),
+    (['RUN', [12790, 3.55, 70.0]], [
+        'Тип тренировки: Running; '
+        'Длительность: 3.550 ч.; '
+        'Дистанция: 8.313 км; '
+        'Ср. скорость: 2.342 км/ч; '
+        'Потрачено ккал: 655.189.'
+    ]),
+    (['RUN', [13623, 0.16, 50.0]], [
+        'Тип тренировки: Running; '
+        'Длительность: 0.160 ч.; '
+        'Дистанция: 8.855 км; '
+        'Ср. скорость: 55.343 км/ч; '
+        'Потрачено ккал: 479.027.'
+    ]),
     (['WLK', [9000, 1, 75, 180]], [
         'Тип тренировки: SportsWalking; '
         'Длительность: 1.000 ч.; '
@@ -451,3 +465,136 @@ def test_main_output(input_data, expected):
     assert get_message_output == expected, (
         'Метод `main` должен печатать результат в консоль.\n'
     )
+
+
+@pytest.mark.parametrize('packages', [
+    [],
+    [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [9000, 1, 75, 180]),
+        ('RUN', [15000, 1, 75]),
+        ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+        ('SWM', [420, 4, 20, 42, 4]),
+    ],
+    [
+        ('RUN', [6901, 0.5, 52]),
+        ('WLK', [19862, 2.5, 50, 188]),
+        ('SWM', [11725, 2.5, 66, 50, 18]),
+        ('RUN', [100000001, 1, 75]),
+    ],
+])
+def test_process_batch(packages):
+    assert hasattr(homework, 'process_batch'), (
+        'Создайте функцию для пакетной обработки данных - `process_batch`'
+    )
+    expected = [
+        homework.read_package(*package).show_training_info().get_message()
+        for package in packages
+    ]
+    result = [
+        info_message.get_message()
+        for info_message in homework.process_batch(packages)
+    ]
+    assert result == expected, (
+        'Функция `process_batch` должна возвращать те же сообщения, '
+        'что и обработка пакетов по одному, в исходном порядке.'
+    )
+
+
+@pytest.mark.parametrize('packages', [
+    [
+        ('SWM', [720, 1, 80, 25, 40]),
+        ('RUN', [1206, 12, 6]),
+        ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+    ],
+    [
+        ('RUN', [6901, 0.5, 52]),
+        ('WLK', [19862, 2.5, 50, 188]),
+        ('SWM', [11725, 2.5, 66, 50, 18]),
+        ('RUN', [100000001, 1, 75]),
+    ],
+])
+def test_process_batch_float32(packages):
+    pytest.importorskip('numpy')
+    expected = [
+        homework.read_package(*package).show_training_info()
+        for package in packages
+    ]
+    result = homework.process_batch(packages, dtype='float32')
+    assert len(result) == len(expected)
+    for info_message, exact in zip(result, expected):
+        assert info_message.training_type == exact.training_type
+        for name in ('duration', 'distance', 'speed', 'calories'):
+            assert getattr(info_message, name) == pytest.approx(
+                getattr(exact, name), rel=1e-5), (
+                f'Расчёт во float32 должен давать `{name}` '
+                'с относительной ошибкой не больше 1e-5.'
+            )
+
+
+def test_run_calories_ufunc32():
+    np = pytest.importorskip('numpy')
+    action = np.array([9000, 420, 1206], dtype=np.float32)
+    duration = np.array([1, 4, 12], dtype=np.float32)
+    weight = np.array([75, 20, 6], dtype=np.float32)
+    result = homework.run_calories_ufunc32(action, duration, weight)
+    assert result.dtype == np.float32
+    expected = homework.run_calories_ufunc(
+        action.astype(np.float64), duration.astype(np.float64),
+        weight.astype(np.float64))
+    assert result == pytest.approx(expected, rel=1e-5)
+
+
+@pytest.mark.parametrize('dtype', ['int64', 'float16', 'complex128'])
+def test_process_batch_rejects_dtype(dtype):
+    pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        homework.process_batch([('RUN', [15000, 1, 75])], dtype=dtype)
+
+
+@pytest.mark.parametrize('package', [
+    ('RUN', [1206, 0, 6]),
+    ('WLK', [9000, 0, 75, 180]),
+    ('SWM', [720, 0, 80, 25, 40]),
+])
+def test_process_batch_zero_duration(package):
+    with pytest.raises(ZeroDivisionError):
+        homework.read_package(*package).show_training_info()
+    with pytest.raises(ZeroDivisionError):
+        homework.process_batch([package])
+
+
+@pytest.mark.parametrize('input_data', [
+    ('SWM', [720, 1, 80, 25, 40]),
+    ('RUN', [12790, 3.55, 70.0]),
+    ('RUN', [13623, 0.16, 50.0]),
+    ('WLK', [3000.33, 2.512, 75.8, 180.1]),
+])
+def test_enable_jit(monkeypatch, input_data):
+    pytest.importorskip('numba')
+    for name in ('_run_cal', '_wlk_cal', '_swm_cal'):
+        monkeypatch.setattr(homework, name, getattr(homework, name))
+    expected = homework.read_package(*input_data).show_training_info()
+    assert homework.enable_jit()
+    result = homework.read_package(*input_data).show_training_info()
+    assert result == expected, (
+        'Скомпилированные ядра должны давать те же числа, '
+        'что и Python-версия.'
+    )
+
+
+@pytest.mark.parametrize('wrapper, dtype', [
+    ('run_calories_ufunc', 'float64'),
+    ('run_calories_ufunc32', 'float32'),
+])
+def test_run_calories_get_ufunc(wrapper, dtype):
+    np = pytest.importorskip('numpy')
+    pytest.importorskip('numba')
+    wrapper = getattr(homework, wrapper)
+    ufunc = wrapper.get_ufunc()
+    assert isinstance(ufunc, np.ufunc)
+    assert ufunc.nin == 3
+    args = [np.array(values, dtype=dtype)
+            for values in ([9000, 420], [1, 4], [75, 20])]
+    assert (ufunc(*args) == wrapper(*args)).all()